@@ -1,24 +1,27 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional, List
 import sqlite3
 import json
 import time
 import os
+import threading
 
 from core.tone_engine import ToneEngine
-from core.memory_manager import MemoryManager
-from core.profile_parser import ProfileParser, UserProfile
+from core.profile_parser import UserProfile
 from core.feedback_processor import FeedbackProcessor
+from core.deps import memory_manager, profile_parser
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
 # Initialize core components
 tone_engine = ToneEngine()
-memory_manager = MemoryManager()
-profile_parser = ProfileParser()
 feedback_processor = FeedbackProcessor()
 
+# Per-user locks serialising long-term memory updates
+_long_term_locks: Dict[str, threading.Lock] = {}
+
 # Database setup
 DB_PATH = "data/users.db"
 
@@ -43,6 +46,10 @@ class ChatResponse(BaseModel):
     base_response: str
     memory_summary: Optional[Dict[str, Any]] = None
 
+class ChatBatchRequest(BaseModel):
+    user_id: str = Field(..., description="User identifier")
+    messages: List[str] = Field(..., description="User messages, processed in order")
+
 class FeedbackRequest(BaseModel):
     user_id: str = Field(..., description="User identifier")
     message_id: Optional[str] = Field(None, description="Message ID for feedback")
@@ -52,107 +59,49 @@ class FeedbackRequest(BaseModel):
     preferences: Optional[Dict[str, float]] = Field(None, description="Direct preference updates")
     context: Optional[str] = Field(None, description="Context for feedback")
 
-@router.post("/", response_model=ChatResponse)
-async def chat(request: ChatRequest):
-    """
-    Process a chat message with tone adaptation
-    """
-    try:
-        # Get user profile
-        user_profile = await get_user_profile(request.user_id)
-        if not user_profile:
-            # Create a default profile for new users
-            default_profile_data = {
-                'user_id': request.user_id,
-                'tone_preferences': {
-                    'formality': 'professional',
-                    'enthusiasm': 'medium',
-                    'verbosity': 'balanced',
-                    'empathy_level': 'medium',
-                    'humor': 'light'
-                },
-                'communication_style': {
-                    'preferred_greeting': 'Hello',
-                    'technical_level': 'intermediate',
-                    'cultural_context': '',
-                    'age_group': 'adult'
-                },
-                'interaction_history': {
-                    'total_interactions': 0,
-                    'successful_tone_matches': 0,
-                    'feedback_score': 0.0,
-                    'last_interaction': None
-                },
-                'context_preferences': None
-            }
-            
-            # Create the profile
-            from core.profile_parser import ProfileParser
-            parser = ProfileParser()
-            user_profile = parser.parse_profile(default_profile_data)
-            
-            # Store the profile in database
-            await update_user_profile(user_profile)
-        
-        # Get conversation history from memory
-        conversation_history = memory_manager.get_short_term_memory(request.user_id)
-        
-        # Process feedback if provided
-        if request.feedback:
-            user_profile = feedback_processor.process_feedback(
-                request.user_id, request.feedback, user_profile
-            )
-            # Update profile in database
-            await update_user_profile(user_profile)
-        
-        # Generate response with enhanced tone adaptation using all four strategies
-        response_data = tone_engine.generate_response_with_tone(
-            request.message, user_profile, conversation_history
-        )
-        
-        # Apply enhanced adaptation strategies
-        adapted_response = tone_engine.adapt_response(
-            response_data['response'], 
-            user_profile, 
-            response_data['context'], 
-            conversation_history,
-            user_id=request.user_id,
-            feedback_data=request.feedback
-        )
-        
-        # Update response data with enhanced adaptation
-        response_data['response'] = adapted_response
-        
-        # Store exchange in memory
-        exchange = {
-            'user_message': request.message,
-            'ai_response': response_data['response'],
-            'context': response_data['context'],
-            'applied_tone': response_data['applied_tone'],
-            'timestamp': time.time()
-        }
-        
-        memory_manager.add_short_term_memory(request.user_id, exchange)
-        
-        # Update long-term memory with learning data
-        learning_data = {
-            'context_preferences': {
-                response_data['context']: {
-                    'count': 1,
-                    'last_used': time.time()
-                }
+async def _get_or_create_profile(user_id: str) -> UserProfile:
+    """Load a user's profile, creating and storing the default profile for new users"""
+    # Get user profile
+    user_profile = await get_user_profile(user_id)
+    if not user_profile:
+        # Create a default profile for new users
+        default_profile_data = {
+            'user_id': user_id,
+            'tone_preferences': {
+                'formality': 'professional',
+                'enthusiasm': 'medium',
+                'verbosity': 'balanced',
+                'empathy_level': 'medium',
+                'humor': 'light'
             },
-            'tone_effectiveness': {
-                'formality': 1.0,
-                'enthusiasm': 1.0,
-                'verbosity': 1.0,
-                'empathy': 1.0,
-                'humor': 1.0
-            }
+            'communication_style': {
+                'preferred_greeting': 'Hello',
+                'technical_level': 'intermediate',
+                'cultural_context': '',
+                'age_group': 'adult'
+            },
+            'interaction_history': {
+                'total_interactions': 0,
+                'successful_tone_matches': 0,
+                'feedback_score': 0.0,
+                'last_interaction': None
+            },
+            'context_preferences': None
         }
         
-        # Merge with existing long-term memory
-        existing_memory = memory_manager.get_long_term_memory(request.user_id)
+        # Create the profile
+        user_profile = profile_parser.parse_profile(default_profile_data)
+        
+        # Store the profile in database
+        await update_user_profile(user_profile)
+    
+    return user_profile
+
+def _merge_long_term_memory(user_id: str, learning_data: Dict[str, Any]):
+    """Merge learning data into a user's long-term memory as one read-modify-write"""
+    # Concurrent requests for the same user would otherwise overwrite each other's updates
+    with _long_term_locks.setdefault(user_id, threading.Lock()):
+        existing_memory = memory_manager.get_long_term_memory(user_id)
         if existing_memory:
             # Update context preferences
             if 'context_preferences' in existing_memory:
@@ -180,20 +129,93 @@ async def chat(request: ChatRequest):
         else:
             existing_memory = learning_data
         
-        memory_manager.add_long_term_memory(request.user_id, existing_memory)
+        memory_manager.add_long_term_memory(user_id, existing_memory)
+
+async def _process_message(user_id: str, message: str, user_profile: UserProfile,
+                           feedback: Optional[Dict[str, Any]] = None) -> ChatResponse:
+    """Generate a tone-adapted response to one message and record it in memory"""
+    # Get conversation history from memory
+    conversation_history = memory_manager.get_short_term_memory(user_id)
+    
+    # Generate response with enhanced tone adaptation using all four strategies
+    response_data = tone_engine.generate_response_with_tone(
+        message, user_profile, conversation_history
+    )
+    
+    # Apply enhanced adaptation strategies
+    adapted_response = tone_engine.adapt_response(
+        response_data['response'], 
+        user_profile, 
+        response_data['context'], 
+        conversation_history,
+        user_id=user_id,
+        feedback_data=feedback
+    )
+    
+    # Update response data with enhanced adaptation
+    response_data['response'] = adapted_response
+    
+    # Store exchange in memory
+    exchange = {
+        'user_message': message,
+        'ai_response': response_data['response'],
+        'context': response_data['context'],
+        'applied_tone': response_data['applied_tone'],
+        'timestamp': time.time()
+    }
+    
+    memory_manager.add_short_term_memory(user_id, exchange)
+    
+    # Update long-term memory with learning data
+    learning_data = {
+        'context_preferences': {
+            response_data['context']: {
+                'count': 1,
+                'last_used': time.time()
+            }
+        },
+        'tone_effectiveness': {
+            'formality': 1.0,
+            'enthusiasm': 1.0,
+            'verbosity': 1.0,
+            'empathy': 1.0,
+            'humor': 1.0
+        }
+    }
+    
+    # Merge with existing long-term memory
+    await run_in_threadpool(_merge_long_term_memory, user_id, learning_data)
+    
+    # Get memory summary
+    memory_summary = await run_in_threadpool(memory_manager.get_memory_summary, user_id)
+    
+    return ChatResponse(
+        response=response_data['response'],
+        context=response_data['context'],
+        context_confidence=response_data['context_confidence'],
+        context_indicators=response_data['context_indicators'],
+        applied_tone=response_data['applied_tone'],
+        base_response=response_data['base_response'],
+        memory_summary=memory_summary
+    )
+
+@router.post("/", response_model=ChatResponse)
+async def chat(request: ChatRequest):
+    """
+    Process a chat message with tone adaptation
+    """
+    try:
+        user_profile = await _get_or_create_profile(request.user_id)
         
-        # Get memory summary
-        memory_summary = memory_manager.get_memory_summary(request.user_id)
+        # Process feedback if provided
+        if request.feedback:
+            user_profile = feedback_processor.process_feedback(
+                request.user_id, request.feedback, user_profile
+            )
+            # Update profile in database
+            await update_user_profile(user_profile)
         
-        return ChatResponse(
-            response=response_data['response'],
-            context=response_data['context'],
-            context_confidence=response_data['context_confidence'],
-            context_indicators=response_data['context_indicators'],
-            applied_tone=response_data['applied_tone'],
-            base_response=response_data['base_response'],
-            memory_summary=memory_summary
-        )
+        return await _process_message(request.user_id, request.message, user_profile, request.feedback)
         
     except HTTPException:
         # Re-raise HTTP exceptions as-is
@@ -205,6 +227,28 @@ async def chat(request: ChatRequest):
             error_details = f"Error processing chat: Unknown error occurred"
         raise HTTPException(status_code=500, detail=error_details)
 
+@router.post("/batch", response_model=List[ChatResponse])
+async def chat_batch(request: ChatBatchRequest):
+    """
+    Process several chat messages from one user in order, loading the profile once
+    """
+    try:
+        user_profile = await _get_or_create_profile(request.user_id)
+        
+        return [
+            await _process_message(request.user_id, message, user_profile)
+            for message in request.messages
+        ]
+        
+    except HTTPException:
+        # Re-raise HTTP exceptions as-is
+        raise
+    except Exception as e:
+        error_details = f"Error processing chat batch: {str(e)}"
+        if str(e) == "":
+            error_details = f"Error processing chat batch: Unknown error occurred"
+        raise HTTPException(status_code=500, detail=error_details)
+
 @router.post("/feedback")
 async def submit_feedback(request: FeedbackRequest):
     """
@@ -252,7 +296,7 @@ async def get_user_memory(user_id: str):
     Get user's memory summary
     """
     try:
-        memory_summary = memory_manager.get_memory_summary(user_id)
+        memory_summary = await run_in_threadpool(memory_manager.get_memory_summary, user_id)
         return memory_summary
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving memory: {str(e)}")
@@ -263,7 +307,7 @@ async def clear_user_memory(user_id: str):
     Clear all memory for a user
     """
     try:
-        memory_manager.clear_user_memory(user_id)
+        await run_in_threadpool(memory_manager.clear_user_memory, user_id)
         return {"message": "Memory cleared successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error clearing memory: {str(e)}")
@@ -281,6 +325,18 @@ async def get_feedback_summary(user_id: str):
 
 # Helper functions
 async def get_user_profile(user_id: str) -> Optional[UserProfile]:
+    """
+    Get user profile from database without blocking the event loop
+    """
+    return await run_in_threadpool(_load_user_profile, user_id)
+
+async def update_user_profile(profile: UserProfile):
+    """
+    Update user profile in database without blocking the event loop
+    """
+    await run_in_threadpool(_save_user_profile, profile)
+
+def _load_user_profile(user_id: str) -> Optional[UserProfile]:
     """
     Get user profile from database
     """
@@ -323,7 +379,7 @@ async def get_user_profile(user_id: str) -> Optional[UserProfile]:
         print(f"Error getting user profile: {e}")
         return None
 
-async def update_user_profile(profile: UserProfile):
+def _save_user_profile(profile: UserProfile):
     """
     Update user profile in database
     """
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional, List
 import sqlite3
@@ -6,13 +7,10 @@ import json
 import time
 import os
 
-from core.memory_manager import MemoryManager
+from core.deps import memory_manager
 
 router = APIRouter(prefix="/api/memory", tags=["memory"])
 
-# Initialize memory manager
-memory_manager = MemoryManager()
-
 class MemoryResponse(BaseModel):
     user_id: str
     short_term_count: int
@@ -33,7 +31,7 @@ async def get_user_memory(user_id: str):
     Get user's memory (short-term and long-term)
     """
     try:
-        memory_summary = memory_manager.get_memory_summary(user_id)
+        memory_summary = await run_in_threadpool(memory_manager.get_memory_summary, user_id)
         
         return MemoryResponse(
             user_id=user_id,
@@ -53,7 +51,7 @@ async def clear_user_memory(user_id: str):
     Clear user's memory
     """
     try:
-        memory_manager.clear_user_memory(user_id)
+        await run_in_threadpool(memory_manager.clear_user_memory, user_id)
         return MemoryClearResponse(
             message="Memory cleared successfully",
             user_id=user_id,
@@ -83,11 +81,11 @@ async def get_long_term_memory(user_id: str):
     Get only long-term memory for user
     """
     try:
-        long_term_memory = memory_manager.get_long_term_memory(user_id)
+        long_term_memory = await run_in_threadpool(memory_manager.get_long_term_memory, user_id)
         return {
             "user_id": user_id,
             "long_term_memory": long_term_memory,
-            "size_kb": memory_manager._get_long_term_size(user_id) / 1024
+            "size_kb": await run_in_threadpool(memory_manager._get_long_term_size, user_id) / 1024
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving long-term memory: {str(e)}")
@@ -98,7 +96,7 @@ async def get_memory_analytics(user_id: str):
     Get memory analytics and insights
     """
     try:
-        memory_summary = memory_manager.get_memory_summary(user_id)
+        memory_summary = await run_in_threadpool(memory_manager.get_memory_summary, user_id)
         
         # Calculate analytics
         short_term = memory_summary["short_term_memory"]
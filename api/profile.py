@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional
 import sqlite3
@@ -6,7 +7,8 @@ import json
 import time
 import os
 
-from core.profile_parser import ProfileParser, UserProfile, TonePreferences, ContextPreferences
+from core.profile_parser import UserProfile, TonePreferences, ContextPreferences
+from core.deps import profile_parser
 
 router = APIRouter(prefix="/api/profile", tags=["profile"])
 
@@ -59,52 +61,15 @@ async def create_or_update_profile(request: ProfileCreateRequest):
     """
     Create or update a user profile with tone preferences
     """
-    parser = ProfileParser()
-    
     # Validate profile data
-    if not parser.validate_profile(request.dict()):
+    if not profile_parser.validate_profile(request.dict()):
         raise HTTPException(status_code=400, detail="Invalid profile data")
     
     # Parse profile
-    profile = parser.parse_profile(request.dict())
+    profile = profile_parser.parse_profile(request.dict())
     
     # Store in database
-    with get_db_connection() as conn:
-        # Check if user already exists
-        cursor = conn.execute("SELECT user_id FROM user_profiles WHERE user_id = ?", (request.user_id,))
-        existing_user = cursor.fetchone()
-        
-        if existing_user:
-            # Update existing profile
-            conn.execute("""
-                UPDATE user_profiles 
-                SET tone_preferences = ?, communication_style = ?, interaction_history = ?, context_preferences = ?, updated_at = ?
-                WHERE user_id = ?
-            """, (
-                json.dumps(profile.tone_preferences.dict()),
-                json.dumps(profile.communication_style.dict()),
-                json.dumps(profile.interaction_history.dict()),
-                json.dumps(profile.context_preferences.dict() if profile.context_preferences else {}),
-                time.strftime('%Y-%m-%d %H:%M:%S'),
-                request.user_id
-            ))
-        else:
-            # Create new profile
-            conn.execute("""
-                INSERT INTO user_profiles 
-                (user_id, tone_preferences, communication_style, interaction_history, context_preferences, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                request.user_id,
-                json.dumps(profile.tone_preferences.dict()),
-                json.dumps(profile.communication_style.dict()),
-                json.dumps(profile.interaction_history.dict()),
-                json.dumps(profile.context_preferences.dict() if profile.context_preferences else {}),
-                time.strftime('%Y-%m-%d %H:%M:%S'),
-                time.strftime('%Y-%m-%d %H:%M:%S')
-            ))
-        
-        conn.commit()
+    await run_in_threadpool(_store_profile, profile)
     
     # Convert context preferences to dict, handling None values
     context_prefs_dict = None
@@ -132,45 +97,38 @@ async def get_profile(user_id: str):
     """
     Retrieve a user profile by user ID
     """
-    with get_db_connection() as conn:
-        cursor = conn.execute("""
-            SELECT user_id, tone_preferences, communication_style, interaction_history, context_preferences, created_at, updated_at
-            FROM user_profiles WHERE user_id = ?
-        """, (user_id,))
-        row = cursor.fetchone()
-        
-        if not row:
-            raise HTTPException(status_code=404, detail="User profile not found")
-        
-        # Parse stored JSON data
-        tone_preferences = json.loads(row['tone_preferences'])
-        communication_style = json.loads(row['communication_style'])
-        interaction_history = json.loads(row['interaction_history'])
-        context_preferences = json.loads(row['context_preferences']) if row['context_preferences'] else None
-        
-        return ProfileResponse(
-            user_id=row['user_id'],
-            tone_preferences=tone_preferences,
-            communication_style=communication_style,
-            interaction_history=interaction_history,
-            context_preferences=context_preferences,
-            created_at=row['created_at'],
-            updated_at=row['updated_at']
-        )
+    row = await run_in_threadpool(_fetch_profile_row, user_id)
+    
+    if not row:
+        raise HTTPException(status_code=404, detail="User profile not found")
+    
+    # Parse stored JSON data
+    tone_preferences = json.loads(row['tone_preferences'])
+    communication_style = json.loads(row['communication_style'])
+    interaction_history = json.loads(row['interaction_history'])
+    context_preferences = json.loads(row['context_preferences']) if row['context_preferences'] else None
+    
+    return ProfileResponse(
+        user_id=row['user_id'],
+        tone_preferences=tone_preferences,
+        communication_style=communication_style,
+        interaction_history=interaction_history,
+        context_preferences=context_preferences,
+        created_at=row['created_at'],
+        updated_at=row['updated_at']
+    )
 
 @router.delete("/{user_id}")
 async def delete_profile(user_id: str):
     """
     Delete a user profile
     """
-    with get_db_connection() as conn:
-        cursor = conn.execute("DELETE FROM user_profiles WHERE user_id = ?", (user_id,))
-        conn.commit()
-        
-        if cursor.rowcount == 0:
-            raise HTTPException(status_code=404, detail="User profile not found")
-        
-        return {"message": "Profile deleted successfully"}
+    deleted = await run_in_threadpool(_delete_profile, user_id)
+    
+    if deleted == 0:
+        raise HTTPException(status_code=404, detail="User profile not found")
+    
+    return {"message": "Profile deleted successfully"}
 
 @router.get("/{user_id}/validate")
 async def validate_profile(user_id: str):
@@ -179,27 +137,22 @@ async def validate_profile(user_id: str):
     """
     try:
         # Get profile
-        with get_db_connection() as conn:
-            cursor = conn.execute("""
-                SELECT tone_preferences, context_preferences FROM user_profiles WHERE user_id = ?
-            """, (user_id,))
-            row = cursor.fetchone()
-            
-            if not row:
-                raise HTTPException(status_code=404, detail="User profile not found")
-            
-            tone_preferences = json.loads(row['tone_preferences'])
-            context_preferences = json.loads(row['context_preferences']) if row['context_preferences'] else {}
+        row = await run_in_threadpool(_fetch_profile_row, user_id)
+        
+        if not row:
+            raise HTTPException(status_code=404, detail="User profile not found")
+        
+        tone_preferences = json.loads(row['tone_preferences'])
+        context_preferences = json.loads(row['context_preferences']) if row['context_preferences'] else {}
         
         # Analyze profile
-        parser = ProfileParser()
         profile_data = {
             'user_id': user_id,
             'tone_preferences': tone_preferences,
             'context_preferences': context_preferences
         }
         
-        profile = parser.parse_profile(profile_data)
+        profile = profile_parser.parse_profile(profile_data)
         
         # Generate analysis
         analysis = {
@@ -246,6 +199,61 @@ async def validate_profile(user_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error validating profile: {str(e)}")
 
+def _store_profile(profile: UserProfile):
+    """Insert or update a parsed profile in the database"""
+    with get_db_connection() as conn:
+        # Check if user already exists
+        cursor = conn.execute("SELECT user_id FROM user_profiles WHERE user_id = ?", (profile.user_id,))
+        existing_user = cursor.fetchone()
+        
+        if existing_user:
+            # Update existing profile
+            conn.execute("""
+                UPDATE user_profiles 
+                SET tone_preferences = ?, communication_style = ?, interaction_history = ?, context_preferences = ?, updated_at = ?
+                WHERE user_id = ?
+            """, (
+                json.dumps(profile.tone_preferences.dict()),
+                json.dumps(profile.communication_style.dict()),
+                json.dumps(profile.interaction_history.dict()),
+                json.dumps(profile.context_preferences.dict() if profile.context_preferences else {}),
+                time.strftime('%Y-%m-%d %H:%M:%S'),
+                profile.user_id
+            ))
+        else:
+            # Create new profile
+            conn.execute("""
+                INSERT INTO user_profiles 
+                (user_id, tone_preferences, communication_style, interaction_history, context_preferences, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (
+                profile.user_id,
+                json.dumps(profile.tone_preferences.dict()),
+                json.dumps(profile.communication_style.dict()),
+                json.dumps(profile.interaction_history.dict()),
+                json.dumps(profile.context_preferences.dict() if profile.context_preferences else {}),
+                time.strftime('%Y-%m-%d %H:%M:%S'),
+                time.strftime('%Y-%m-%d %H:%M:%S')
+            ))
+        
+        conn.commit()
+
+def _fetch_profile_row(user_id: str) -> Optional[sqlite3.Row]:
+    """Fetch the stored profile row for a user"""
+    with get_db_connection() as conn:
+        cursor = conn.execute("""
+            SELECT user_id, tone_preferences, communication_style, interaction_history, context_preferences, created_at, updated_at
+            FROM user_profiles WHERE user_id = ?
+        """, (user_id,))
+        return cursor.fetchone()
+
+def _delete_profile(user_id: str) -> int:
+    """Delete a stored profile and return the number of removed rows"""
+    with get_db_connection() as conn:
+        cursor = conn.execute("DELETE FROM user_profiles WHERE user_id = ?", (user_id,))
+        conn.commit()
+        return cursor.rowcount
+
 def _get_tone_description(value: str, tone_type: str) -> str:
     """Convert tone value to human-readable description"""
     if tone_type == 'formality':
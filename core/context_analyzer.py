@@ -1,7 +1,11 @@
 import re
+import functools
 from typing import Dict, List, Tuple, Optional
 from enum import Enum
 
+# Number of distinct messages whose scores and indicators are memoized per analyzer
+ANALYSIS_CACHE_SIZE = 512
+
 class ContextType(Enum):
     WORK = "work"
     PERSONAL = "personal"
@@ -73,18 +77,49 @@ class ContextAnalyzer:
             r'\b(statistics|statistical)\s+(analysis|test|method)',
             r'\b(peer\s+review|academic\s+writing)\s+(process|submission)'
         ]
+        
+        # Time-related indicators for each context
+        self.work_time_patterns = [
+            r'\b(9|10|11|12|1|2|3|4|5|6|7|8)\s*(am|pm)\s*(meeting|call|appointment)',
+            r'\b(monday|tuesday|wednesday|thursday|friday)\s+(morning|afternoon|evening)',
+            r'\b(deadline|due\s+date)\s+(today|tomorrow|this\s+week)',
+            r'\b(work|office)\s+(schedule|hours|time)'
+        ]
+        
+        self.personal_time_patterns = [
+            r'\b(weekend|saturday|sunday)\s+(plan|activity|event)',
+            r'\b(vacation|holiday|break)\s+(plan|trip|activity)',
+            r'\b(birthday|anniversary|celebration)\s+(party|event)',
+            r'\b(family|friend)\s+(dinner|lunch|coffee)'
+        ]
+        
+        self.academic_time_patterns = [
+            r'\b(semester|quarter|term)\s+(exam|assignment|deadline)',
+            r'\b(lecture|class|course)\s+(schedule|time|room)',
+            r'\b(research|study)\s+(session|period|time)',
+            r'\b(thesis|dissertation)\s+(defense|submission|deadline)'
+        ]
+        
+        # Compile every pattern once instead of on each scoring call
+        self._work_phrase_res = [re.compile(p) for p in self.work_phrases]
+        self._personal_phrase_res = [re.compile(p) for p in self.personal_phrases]
+        self._academic_phrase_res = [re.compile(p) for p in self.academic_phrases]
+        self._work_time_res = [re.compile(p) for p in self.work_time_patterns]
+        self._personal_time_res = [re.compile(p) for p in self.personal_time_patterns]
+        self._academic_time_res = [re.compile(p) for p in self.academic_time_patterns]
+        
+        # Scores and indicators are pure functions of the lowercased message,
+        # so repeated messages reuse them. Cached results must not be mutated.
+        self._score_message = functools.lru_cache(maxsize=ANALYSIS_CACHE_SIZE)(self._score_message)
+        self._find_indicators = functools.lru_cache(maxsize=ANALYSIS_CACHE_SIZE)(self._find_indicators)
     
     def analyze_context(self, message: str, user_id: str = None, 
                        conversation_history: List[Dict] = None) -> ContextType:
         """
         Analyze message context using keyword matching, phrase patterns, and conversation history
         """
-        message_lower = message.lower()
-        
         # Calculate scores for each context type
-        work_score = self._calculate_work_score(message_lower)
-        personal_score = self._calculate_personal_score(message_lower)
-        academic_score = self._calculate_academic_score(message_lower)
+        work_score, personal_score, academic_score = self._score_message(message.lower())
         
         # Consider conversation history if available
         if conversation_history:
@@ -106,6 +141,18 @@ class ContextAnalyzer:
         else:
             return ContextType.UNKNOWN
     
+    def analyze_context_batch(self, messages: List[str]) -> List[ContextType]:
+        """Analyze the context of several messages in one call"""
+        return [self.analyze_context(message) for message in messages]
+    
+    def _score_message(self, message_lower: str) -> Tuple[float, float, float]:
+        """Calculate work, personal and academic scores for a lowercased message"""
+        return (
+            self._calculate_work_score(message_lower),
+            self._calculate_personal_score(message_lower),
+            self._calculate_academic_score(message_lower)
+        )
+    
     def _calculate_work_score(self, message: str) -> float:
         """Calculate work context score"""
         score = 0.0
@@ -115,20 +162,13 @@ class ContextAnalyzer:
         score += work_keyword_count * 0.1
         
         # Phrase pattern matching
-        for pattern in self.work_phrases:
-            if re.search(pattern, message):
+        for pattern in self._work_phrase_res:
+            if pattern.search(message):
                 score += 0.3
         
         # Time-related work indicators
-        time_work_patterns = [
-            r'\b(9|10|11|12|1|2|3|4|5|6|7|8)\s*(am|pm)\s*(meeting|call|appointment)',
-            r'\b(monday|tuesday|wednesday|thursday|friday)\s+(morning|afternoon|evening)',
-            r'\b(deadline|due\s+date)\s+(today|tomorrow|this\s+week)',
-            r'\b(work|office)\s+(schedule|hours|time)'
-        ]
-        
-        for pattern in time_work_patterns:
-            if re.search(pattern, message):
+        for pattern in self._work_time_res:
+            if pattern.search(message):
                 score += 0.2
         
         return min(1.0, score)
@@ -142,20 +182,13 @@ class ContextAnalyzer:
         score += personal_keyword_count * 0.1
         
         # Phrase pattern matching
-        for pattern in self.personal_phrases:
-            if re.search(pattern, message):
+        for pattern in self._personal_phrase_res:
+            if pattern.search(message):
                 score += 0.3
         
         # Personal time indicators
-        personal_time_patterns = [
-            r'\b(weekend|saturday|sunday)\s+(plan|activity|event)',
-            r'\b(vacation|holiday|break)\s+(plan|trip|activity)',
-            r'\b(birthday|anniversary|celebration)\s+(party|event)',
-            r'\b(family|friend)\s+(dinner|lunch|coffee)'
-        ]
-        
-        for pattern in personal_time_patterns:
-            if re.search(pattern, message):
+        for pattern in self._personal_time_res:
+            if pattern.search(message):
                 score += 0.2
         
         return min(1.0, score)
@@ -169,20 +202,13 @@ class ContextAnalyzer:
         score += academic_keyword_count * 0.1
         
         # Phrase pattern matching
-        for pattern in self.academic_phrases:
-            if re.search(pattern, message):
+        for pattern in self._academic_phrase_res:
+            if pattern.search(message):
                 score += 0.3
         
         # Academic time indicators
-        academic_time_patterns = [
-            r'\b(semester|quarter|term)\s+(exam|assignment|deadline)',
-            r'\b(lecture|class|course)\s+(schedule|time|room)',
-            r'\b(research|study)\s+(session|period|time)',
-            r'\b(thesis|dissertation)\s+(defense|submission|deadline)'
-        ]
-        
-        for pattern in academic_time_patterns:
-            if re.search(pattern, message):
+        for pattern in self._academic_time_res:
+            if pattern.search(message):
                 score += 0.2
         
         return min(1.0, score)
@@ -210,11 +236,7 @@ class ContextAnalyzer:
     
     def get_context_confidence(self, message: str) -> Dict[str, float]:
         """Get confidence scores for each context type"""
-        message_lower = message.lower()
-        
-        work_score = self._calculate_work_score(message_lower)
-        personal_score = self._calculate_personal_score(message_lower)
-        academic_score = self._calculate_academic_score(message_lower)
+        work_score, personal_score, academic_score = self._score_message(message.lower())
         
         return {
             'work': work_score,
@@ -225,7 +247,14 @@ class ContextAnalyzer:
     
     def extract_context_indicators(self, message: str) -> Dict[str, List[str]]:
         """Extract specific indicators that led to context classification"""
-        message_lower = message.lower()
+        # Copy the cached tuples so callers get lists they can modify
+        return {
+            context: list(found)
+            for context, found in self._find_indicators(message.lower()).items()
+        }
+    
+    def _find_indicators(self, message_lower: str) -> Dict[str, Tuple[str, ...]]:
+        """Find the keywords and phrase matches for each context in a lowercased message"""
         indicators = {
             'work': [],
             'personal': [],
@@ -237,8 +266,8 @@ class ContextAnalyzer:
             if keyword in message_lower:
                 indicators['work'].append(keyword)
         
-        for pattern in self.work_phrases:
-            matches = re.findall(pattern, message_lower)
+        for pattern in self._work_phrase_res:
+            matches = pattern.findall(message_lower)
             # Convert tuples to strings
             for match in matches:
                 if isinstance(match, tuple):
@@ -251,8 +280,8 @@ class ContextAnalyzer:
             if keyword in message_lower:
                 indicators['personal'].append(keyword)
         
-        for pattern in self.personal_phrases:
-            matches = re.findall(pattern, message_lower)
+        for pattern in self._personal_phrase_res:
+            matches = pattern.findall(message_lower)
             # Convert tuples to strings
             for match in matches:
                 if isinstance(match, tuple):
@@ -265,8 +294,8 @@ class ContextAnalyzer:
             if keyword in message_lower:
                 indicators['academic'].append(keyword)
         
-        for pattern in self.academic_phrases:
-            matches = re.findall(pattern, message_lower)
+        for pattern in self._academic_phrase_res:
+            matches = pattern.findall(message_lower)
             # Convert tuples to strings
             for match in matches:
                 if isinstance(match, tuple):
@@ -274,4 +303,4 @@ class ContextAnalyzer:
                 else:
                     indicators['academic'].append(match)
         
-        return indicators 
\ No newline at end of file
+        return {context: tuple(found) for context, found in indicators.items()} 
\ No newline at end of file
@@ -0,0 +1,6 @@
+from core.memory_manager import MemoryManager
+from core.profile_parser import ProfileParser
+
+# Components shared by the API routers, so no router depends on another's globals
+memory_manager = MemoryManager()
+profile_parser = ProfileParser()
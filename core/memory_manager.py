@@ -5,6 +5,7 @@ from typing import Dict, List, Optional, Any
 from collections import deque
 import threading
 import os
+from contextlib import contextmanager
 
 class MemoryManager:
     def __init__(self, db_path: str = "data/users.db", max_short_term: int = 10, max_long_term_kb: int = 50):
@@ -14,14 +15,36 @@ class MemoryManager:
         self.short_term_memory: Dict[str, deque] = {}
         self.lock = threading.Lock()
         
+        # An in-memory database only lives as long as its connection, so keep one open
+        self._memory_conn = sqlite3.connect(":memory:", check_same_thread=False) if db_path == ":memory:" else None
+        # That shared connection is not safe for concurrent use, so callers take turns
+        self._memory_conn_lock = threading.Lock()
+        
         # Initialize database
         self._init_database()
     
+    @contextmanager
+    def _connect(self):
+        """Open a transaction on the memory database"""
+        if self._memory_conn is not None:
+            with self._memory_conn_lock, self._memory_conn as conn:
+                yield conn
+            return
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
     def _init_database(self):
         """Initialize SQLite database with memory table"""
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS long_term_memory (
                     user_id TEXT PRIMARY KEY,
@@ -57,7 +80,7 @@ class MemoryManager:
         if current_size + size_bytes > self.max_long_term_kb * 1024:
             self._cleanup_long_term_memory(user_id, size_bytes)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("""
                 INSERT OR REPLACE INTO long_term_memory 
                 (user_id, memory_data, last_updated, size_bytes)
@@ -67,7 +90,7 @@ class MemoryManager:
     
     def get_long_term_memory(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get long-term memory for user with decay applied"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("""
                 SELECT memory_data, last_updated FROM long_term_memory 
                 WHERE user_id = ?
@@ -105,7 +128,7 @@ class MemoryManager:
     
     def _get_long_term_size(self, user_id: str) -> int:
         """Get current size of long-term memory for user"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("""
                 SELECT size_bytes FROM long_term_memory WHERE user_id = ?
             """, (user_id,))
@@ -114,7 +137,7 @@ class MemoryManager:
     
     def _cleanup_long_term_memory(self, user_id: str, new_size: int):
         """Clean up old memory entries to make room"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             # Get all entries sorted by age (oldest first)
             cursor = conn.execute("""
                 SELECT memory_data, last_updated FROM long_term_memory 
@@ -145,7 +168,7 @@ class MemoryManager:
             if user_id in self.short_term_memory:
                 self.short_term_memory[user_id].clear()
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("DELETE FROM long_term_memory WHERE user_id = ?", (user_id,))
             conn.commit()
     
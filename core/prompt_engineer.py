@@ -11,6 +11,9 @@ from collections import defaultdict
 from dataclasses import dataclass
 from enum import Enum
 
+# Matches {variable} placeholders in prompt templates
+TEMPLATE_VARIABLE_PATTERN = re.compile(r'\{(\w+)\}')
+
 class PromptType(Enum):
     """Types of prompts for different use cases"""
     CONVERSATION = "conversation"
@@ -51,6 +54,8 @@ class CustomPromptEngineer:
         self.context_patterns = self._initialize_context_patterns()
         self.style_adapters = self._initialize_style_adapters()
         self.prompt_history = defaultdict(list)
+        # Styled templates are built once per (prompt type, style) and reused
+        self._styled_templates: Dict[Tuple[str, PromptStyle], str] = {}
         
     def _initialize_templates(self) -> Dict[str, PromptTemplate]:
         """Initialize prompt templates"""
@@ -190,7 +195,7 @@ class CustomPromptEngineer:
             raise ValueError(f"Missing required variables: {missing_vars}")
         
         # Apply style adaptation
-        adapted_template = self._apply_style(template.template, style)
+        adapted_template = self._get_styled_template(prompt_type, style)
         
         # Fill template with variables
         prompt = adapted_template.format(**variables)
@@ -204,6 +209,15 @@ class CustomPromptEngineer:
         
         return prompt
     
+    def _get_styled_template(self, prompt_type: str, style: PromptStyle) -> str:
+        """Get the styled template for a prompt type, building it on first use"""
+        key = (prompt_type, style)
+        styled_template = self._styled_templates.get(key)
+        if styled_template is None:
+            styled_template = self._apply_style(self.templates[prompt_type].template, style)
+            self._styled_templates[key] = styled_template
+        return styled_template
+    
     def _apply_style(self, template: str, style: PromptStyle) -> str:
         """Apply style adaptation to template"""
         if style not in self.style_adapters:
@@ -211,17 +225,21 @@ class CustomPromptEngineer:
         
         adapter = self.style_adapters[style]
         
-        # Apply prefix and suffix
-        styled_template = f"{adapter['prefix']}{template}{adapter['suffix']}"
+        # Wrap each placeholder in the style's variable format, keeping the placeholder
+        # itself so format() still fills in the value; literal braces in the format are escaped
+        before, after = (
+            part.replace('{', '{{').replace('}', '}}')
+            for part in adapter['variable_format'].split('{variable}', 1)
+        )
         
-        # Apply variable formatting
-        for var in re.findall(r'\{(\w+)\}', template):
-            styled_template = styled_template.replace(
-                f"{{{var}}}", 
-                adapter['variable_format'].replace('{variable}', var)
-            )
+        # Apply variable formatting in a single pass
+        styled_template = TEMPLATE_VARIABLE_PATTERN.sub(
+            lambda match: f"{before}{{{match.group(1)}}}{after}",
+            template
+        )
         
-        return styled_template
+        # Apply prefix and suffix
+        return f"{adapter['prefix']}{styled_template}{adapter['suffix']}"
     
     def _add_context(self, prompt: str, context: Dict[str, Any]) -> str:
         """Add context information to prompt"""
@@ -289,7 +307,7 @@ class CustomPromptEngineer:
                 target_style = PromptStyle.DIRECT
         
         # Create optimized template
-        optimized_template = self._apply_style(template.template, target_style)
+        optimized_template = self._get_styled_template(prompt_type, target_style)
         
         return optimized_template
     
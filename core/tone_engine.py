@@ -1,5 +1,5 @@
 from typing import Dict, Any, List, Optional
-from .profile_parser import TonePreferences, UserProfile
+from .profile_parser import TonePreferences, UserProfile, ProfileParser
 from .context_analyzer import ContextType, ContextAnalyzer
 import re
 import random
@@ -9,6 +9,7 @@ from collections import deque
 class ToneEngine:
     def __init__(self):
         self.context_analyzer = ContextAnalyzer()
+        self.profile_parser = ProfileParser()
         
         # Conversation flow tracking for dynamic adjustment
         self.conversation_flows = {}  # user_id -> deque of recent exchanges
@@ -125,15 +126,23 @@ class ToneEngine:
             }
         }
     
+    def reset(self):
+        """Clear all per-user tracking state, keeping the loaded tone patterns"""
+        self.conversation_flows.clear()
+        self.context_transitions.clear()
+        self.tone_effectiveness.clear()
+        self.feedback_learning.clear()
+        self.adaptive_preferences.clear()
+        self.context_history.clear()
+        self.topic_transitions.clear()
+    
     def baseline_matching(self, user_profile: UserProfile, context: ContextType) -> TonePreferences:
         """
         Strategy 1: Baseline Matching - Start with profile preferences
         """
-        from .profile_parser import ProfileParser
-        parser = ProfileParser()
         # Use .value if context is Enum, else use as is
         context_val = context.value if hasattr(context, 'value') else str(context)
-        return parser.get_tone_for_context(user_profile, context_val)
+        return self.profile_parser.get_tone_for_context(user_profile, context_val)
     
     def dynamic_adjustment(self, user_id: str, baseline_prefs: TonePreferences, 
                           conversation_history: List[Dict] = None) -> TonePreferences:
@@ -240,19 +249,25 @@ class ToneEngine:
         if not conversation_history:
             return flow_analysis
         
-        # Analyze message length trends
-        recent_messages = conversation_history[-5:] if len(conversation_history) >= 5 else conversation_history
-        message_lengths = [len(msg.get('message', '')) for msg in recent_messages]
+        # Collect message lengths and topics in a single pass over the recent window
+        total_length = 0
+        previous_length = last_length = None
+        topics = set()
+        for msg in conversation_history[-5:]:
+            previous_length, last_length = last_length, len(msg.get('message', ''))
+            total_length += last_length
+            topics.add(msg.get('context', 'unknown'))
+        message_count = min(len(conversation_history), 5)
         
-        if len(message_lengths) >= 2:
-            if message_lengths[-1] > message_lengths[-2] * 1.5:
+        # Analyze message length trends
+        if previous_length is not None:
+            if last_length > previous_length * 1.5:
                 flow_analysis['message_length_trend'] = 'increasing'
-            elif message_lengths[-1] < message_lengths[-2] * 0.7:
+            elif last_length < previous_length * 0.7:
                 flow_analysis['message_length_trend'] = 'decreasing'
         
         # Analyze topic consistency
-        topics = [msg.get('context', 'unknown') for msg in recent_messages]
-        unique_topics = len(set(topics))
+        unique_topics = len(topics)
         if unique_topics <= 2:
             flow_analysis['topic_consistency'] = 'high'
         elif unique_topics <= 3:
@@ -261,7 +276,7 @@ class ToneEngine:
             flow_analysis['topic_consistency'] = 'low'
         
         # Analyze user engagement (based on message complexity)
-        avg_length = sum(message_lengths) / len(message_lengths) if message_lengths else 0
+        avg_length = total_length / message_count
         if avg_length > 100:
             flow_analysis['user_engagement'] = 'high'
         elif avg_length > 50:
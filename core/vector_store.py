@@ -6,12 +6,35 @@ Built from scratch without external frameworks as per implementation constraints
 import math
 import json
 import time
+import functools
 from typing import Dict, List, Any, Optional, Tuple
 from collections import defaultdict
+from array import array
 import hashlib
+import heapq
+import operator
 import sqlite3
 import threading
 
+INSERT_VECTOR_SQL = """
+    INSERT OR REPLACE INTO vectors 
+    (id, user_id, content, vector_data, metadata, timestamp, context, embedding_type,
+     vector_int8, vector_scale)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Every write bumps this counter in the same transaction, so a store can tell
+# when another instance or process has changed the database since its last sync
+BUMP_VERSION_SQL = "UPDATE store_version SET version = version + 1 WHERE id = 0"
+SELECT_VERSION_SQL = "SELECT version FROM store_version WHERE id = 0"
+
+# Number of distinct texts whose embeddings are memoized per store
+EMBEDDING_CACHE_SIZE = 4096
+# Candidates re-scored with full-precision vectors per requested result
+RERANK_FACTOR = 4
+# Slack applied to the threshold when filtering on quantized scores
+QUANTIZATION_MARGIN = 0.05
+
 class CustomVectorStore:
     """
     Custom vector storage system built from scratch
@@ -24,11 +47,28 @@ class CustomVectorStore:
     def __init__(self, db_path: str = "vector_store.db"):
         self.db_path = db_path
         self.lock = threading.Lock()
+        # In-memory embedding index: user_id -> {vector_id: (int8 vector, scale)}
+        self._index: Dict[str, Dict[str, Tuple[array, float]]] = defaultdict(dict)
+        # Database version the index reflects; None forces a reload before the next search
+        self._index_version: Optional[int] = None
+        # Embeddings are pure functions of the text, so repeated queries reuse them.
+        # Cached vectors are shared between callers and must not be mutated.
+        self._text_to_vector = functools.lru_cache(maxsize=EMBEDDING_CACHE_SIZE)(self._text_to_vector)
         self._init_database()
+        self._load_index()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection tuned for write throughput"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
     
     def _init_database(self):
         """Initialize the vector storage database"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            # WAL is persistent for the database file, so set it once
+            conn.execute("PRAGMA journal_mode=WAL")
+            
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS vectors (
                     id TEXT PRIMARY KEY,
@@ -38,10 +78,19 @@ class CustomVectorStore:
                     metadata TEXT,
                     timestamp REAL NOT NULL,
                     context TEXT,
-                    embedding_type TEXT DEFAULT 'text'
+                    embedding_type TEXT DEFAULT 'text',
+                    vector_int8 BLOB,
+                    vector_scale REAL
                 )
             """)
             
+            # Add quantized embedding columns to databases created before them
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(vectors)")}
+            if 'vector_int8' not in columns:
+                conn.execute("ALTER TABLE vectors ADD COLUMN vector_int8 BLOB")
+            if 'vector_scale' not in columns:
+                conn.execute("ALTER TABLE vectors ADD COLUMN vector_scale REAL")
+            
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS similarity_cache (
                     vector_id1 TEXT,
@@ -52,10 +101,66 @@ class CustomVectorStore:
                 )
             """)
             
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS store_version (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    version INTEGER NOT NULL
+                )
+            """)
+            conn.execute("INSERT OR IGNORE INTO store_version (id, version) VALUES (0, 0)")
+            
             conn.execute("CREATE INDEX IF NOT EXISTS idx_user_id ON vectors(user_id)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_timestamp ON vectors(timestamp)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_context ON vectors(context)")
     
+    def _load_index(self):
+        """Load stored embeddings into the in-memory index"""
+        index, version = self._read_index()
+        
+        with self.lock:
+            self._index = index
+            self._index_version = version
+    
+    def _read_index(self) -> Tuple[Dict[str, Dict[str, Tuple[array, float]]], int]:
+        """Read every stored embedding into a fresh index, with the database version it reflects"""
+        index = defaultdict(dict)
+        with self._connect() as conn:
+            # Read the version first: a write landing before the rows makes the index
+            # newer than its version, which only costs an extra reload later
+            version = conn.execute(SELECT_VERSION_SQL).fetchone()[0]
+            for vector_id, user_id, vector_data, vector_int8, vector_scale in conn.execute(
+                "SELECT id, user_id, vector_data, vector_int8, vector_scale FROM vectors"
+            ):
+                if vector_int8 is None:
+                    # Rows stored before quantization was added
+                    index[user_id][vector_id] = self._quantize(json.loads(vector_data))
+                else:
+                    quantized = array('b')
+                    quantized.frombytes(vector_int8)
+                    index[user_id][vector_id] = (quantized, vector_scale)
+        
+        return index, version
+    
+    def _bump_version(self, conn: sqlite3.Connection) -> int:
+        """Record a write in the database version counter, inside the caller's transaction"""
+        conn.execute(BUMP_VERSION_SQL)
+        return conn.execute(SELECT_VERSION_SQL).fetchone()[0]
+    
+    def _record_write(self, version: int):
+        """Advance the index version after a write of our own; call with the lock held"""
+        if self._index_version is not None and version == self._index_version + 1:
+            self._index_version = version
+        else:
+            # Someone else wrote in between, so the index is missing their changes
+            self._index_version = None
+    
+    def _sync_index(self):
+        """Reload the index if the database changed outside this store; call with the lock held"""
+        with self._connect() as conn:
+            version = conn.execute(SELECT_VERSION_SQL).fetchone()[0]
+        if version != self._index_version:
+            self._index, self._index_version = self._read_index()
+    
     def _text_to_vector(self, text: str) -> List[float]:
         """
         Convert text to a simple vector representation
@@ -112,48 +217,96 @@ class CustomVectorStore:
         if len(vec1) != len(vec2):
             return 0.0
         
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        magnitude1 = math.sqrt(sum(a * a for a in vec1))
-        magnitude2 = math.sqrt(sum(b * b for b in vec2))
+        dot_product = sum(map(operator.mul, vec1, vec2))
+        magnitude1 = math.sqrt(sum(map(operator.mul, vec1, vec1)))
+        magnitude2 = math.sqrt(sum(map(operator.mul, vec2, vec2)))
         
         if magnitude1 == 0 or magnitude2 == 0:
             return 0.0
         
         return dot_product / (magnitude1 * magnitude2)
     
+    def embedding_cache_info(self):
+        """Get hit/miss statistics for the embedding cache"""
+        return self._text_to_vector.cache_info()
+    
+    def _quantize(self, vector: List[float]) -> Tuple[array, float]:
+        """Quantize a vector to int8 with a per-vector scale"""
+        max_abs = max((abs(x) for x in vector), default=0.0)
+        scale = max_abs / 127 if max_abs > 0 else 1.0
+        return array('b', (round(x / scale) for x in vector)), scale
+    
+    def _quantized_similarity(self, query: Tuple[array, float], stored: Tuple[array, float]) -> float:
+        """Approximate cosine similarity of two normalized, quantized vectors"""
+        query_vector, query_scale = query
+        stored_vector, stored_scale = stored
+        if len(query_vector) != len(stored_vector):
+            return 0.0
+        
+        dot_product = sum(map(operator.mul, query_vector, stored_vector))
+        return dot_product * query_scale * stored_scale
+    
     def _generate_id(self, content: str, user_id: str) -> str:
         """Generate unique ID for vector"""
         combined = f"{user_id}:{content}:{time.time()}"
         return hashlib.md5(combined.encode()).hexdigest()
     
+    def _prepare_vector(self, user_id: str, content: str, metadata: Dict[str, Any] = None,
+                        context: str = None, embedding_type: str = "text") -> Tuple[tuple, Tuple[array, float]]:
+        """Build the database row and index entry for a new vector"""
+        vector_data = self._text_to_vector(content)
+        quantized, scale = self._quantize(vector_data)
+        row = (
+            self._generate_id(content, user_id),
+            user_id,
+            content,
+            json.dumps(vector_data),
+            json.dumps(metadata) if metadata else None,
+            time.time(),
+            context,
+            embedding_type,
+            quantized.tobytes(),
+            scale
+        )
+        return row, (quantized, scale)
+    
     def add_vector(self, user_id: str, content: str, metadata: Dict[str, Any] = None,
                    context: str = None, embedding_type: str = "text") -> str:
         """Add a vector to the store"""
+        # Embed outside the lock so concurrent callers only serialise on the write
+        row, entry = self._prepare_vector(user_id, content, metadata, context, embedding_type)
+        
+        with self.lock:
+            with self._connect() as conn:
+                conn.execute(INSERT_VECTOR_SQL, row)
+                version = self._bump_version(conn)
+            
+            self._index[user_id][row[0]] = entry
+            self._record_write(version)
+            
+            return row[0]
+    
+    def add_vectors(self, items: List[Dict[str, Any]]) -> List[str]:
+        """
+        Add several vectors in a single transaction
+        Each item takes the keyword arguments of add_vector
+        """
+        prepared = [self._prepare_vector(**item) for item in items]
+        
         with self.lock:
-            vector_data = self._text_to_vector(content)
-            vector_id = self._generate_id(content, user_id)
+            with self._connect() as conn:
+                conn.executemany(INSERT_VECTOR_SQL, [row for row, _ in prepared])
+                version = self._bump_version(conn)
             
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT OR REPLACE INTO vectors 
-                    (id, user_id, content, vector_data, metadata, timestamp, context, embedding_type)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    vector_id,
-                    user_id,
-                    content,
-                    json.dumps(vector_data),
-                    json.dumps(metadata) if metadata else None,
-                    time.time(),
-                    context,
-                    embedding_type
-                ))
+            for row, entry in prepared:
+                self._index[row[1]][row[0]] = entry
+            self._record_write(version)
             
-            return vector_id
+            return [row[0] for row, _ in prepared]
     
     def get_vector(self, vector_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve a vector by ID"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("""
                 SELECT id, user_id, content, vector_data, metadata, timestamp, context, embedding_type
                 FROM vectors WHERE id = ?
@@ -177,44 +330,60 @@ class CustomVectorStore:
                     limit: int = 10, threshold: float = 0.5) -> List[Dict[str, Any]]:
         """Find similar vectors"""
         query_vector = self._text_to_vector(query_content)
+        query_quantized = self._quantize(query_vector)
         
-        with sqlite3.connect(self.db_path) as conn:
+        # Score against the in-memory index instead of decoding every stored row
+        with self.lock:
+            self._sync_index()
             if user_id:
-                cursor = conn.execute("""
-                    SELECT id, user_id, content, vector_data, metadata, timestamp, context, embedding_type
-                    FROM vectors WHERE user_id = ?
-                    ORDER BY timestamp DESC
-                """, (user_id,))
+                candidates = list(self._index.get(user_id, {}).items())
             else:
-                cursor = conn.execute("""
-                    SELECT id, user_id, content, vector_data, metadata, timestamp, context, embedding_type
-                    FROM vectors ORDER BY timestamp DESC
-                """)
-            
-            similarities = []
-            for row in cursor.fetchall():
-                stored_vector = json.loads(row[3])
-                similarity = self._cosine_similarity(query_vector, stored_vector)
-                
-                if similarity >= threshold:
-                    similarities.append({
-                        'id': row[0],
-                        'user_id': row[1],
-                        'content': row[2],
-                        'similarity': similarity,
-                        'metadata': json.loads(row[4]) if row[4] else None,
-                        'timestamp': row[5],
-                        'context': row[6],
-                        'embedding_type': row[7]
-                    })
-            
-            # Sort by similarity and return top results
-            similarities.sort(key=lambda x: x['similarity'], reverse=True)
-            return similarities[:limit]
+                candidates = [item for vectors in self._index.values() for item in vectors.items()]
+        
+        # Coarse pass on int8 vectors, keeping a margin for quantization error
+        coarse_threshold = threshold - QUANTIZATION_MARGIN
+        scored = []
+        for vector_id, stored in candidates:
+            similarity = self._quantized_similarity(query_quantized, stored)
+            if similarity >= coarse_threshold:
+                scored.append((similarity, vector_id))
+        
+        # Partial top-k selection instead of sorting every candidate
+        scored = heapq.nlargest(limit * RERANK_FACTOR, scored, key=lambda x: x[0])
+        if not scored:
+            return []
+        
+        # Fetch the shortlisted rows and re-rank with full-precision vectors
+        vector_ids = [vector_id for _, vector_id in scored]
+        placeholders = ", ".join("?" for _ in vector_ids)
+        with self._connect() as conn:
+            cursor = conn.execute(f"""
+                SELECT id, user_id, content, vector_data, metadata, timestamp, context, embedding_type
+                FROM vectors WHERE id IN ({placeholders})
+            """, vector_ids)
+            rows = cursor.fetchall()
+        
+        similarities = []
+        for row in rows:
+            similarity = self._cosine_similarity(query_vector, json.loads(row[3]))
+            if similarity >= threshold:
+                similarities.append({
+                    'id': row[0],
+                    'user_id': row[1],
+                    'content': row[2],
+                    'similarity': similarity,
+                    'metadata': json.loads(row[4]) if row[4] else None,
+                    'timestamp': row[5],
+                    'context': row[6],
+                    'embedding_type': row[7]
+                })
+        
+        # Return top results by similarity
+        return heapq.nlargest(limit, similarities, key=lambda x: x['similarity'])
     
     def get_user_vectors(self, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Get all vectors for a specific user"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("""
                 SELECT id, user_id, content, vector_data, metadata, timestamp, context, embedding_type
                 FROM vectors WHERE user_id = ?
@@ -240,20 +409,31 @@ class CustomVectorStore:
     def delete_vector(self, vector_id: str) -> bool:
         """Delete a vector by ID"""
         with self.lock:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("DELETE FROM vectors WHERE id = ?", (vector_id,))
-                return cursor.rowcount > 0
+                version = self._bump_version(conn)
+            
+            for vectors in self._index.values():
+                vectors.pop(vector_id, None)
+            self._record_write(version)
+            
+            return cursor.rowcount > 0
     
     def delete_user_vectors(self, user_id: str) -> int:
         """Delete all vectors for a user"""
         with self.lock:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("DELETE FROM vectors WHERE user_id = ?", (user_id,))
-                return cursor.rowcount
+                version = self._bump_version(conn)
+            
+            self._index.pop(user_id, None)
+            self._record_write(version)
+            
+            return cursor.rowcount
     
     def get_vector_stats(self, user_id: str = None) -> Dict[str, Any]:
         """Get statistics about stored vectors"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             if user_id:
                 cursor = conn.execute("""
                     SELECT COUNT(*) as total, 
@@ -288,13 +468,21 @@ class CustomVectorStore:
         cutoff_time = time.time() - (max_age_days * 24 * 60 * 60)
         
         with self.lock:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("DELETE FROM vectors WHERE timestamp < ?", (cutoff_time,))
-                return cursor.rowcount
+                deleted = cursor.rowcount
+                if deleted:
+                    self._bump_version(conn)
+            
+            # Reload under the lock so a concurrent insert can't be lost to a stale index
+            if deleted:
+                self._index, self._index_version = self._read_index()
+        
+        return deleted
     
     def search_by_context(self, context: str, user_id: str = None, limit: int = 20) -> List[Dict[str, Any]]:
         """Search vectors by context"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             if user_id:
                 cursor = conn.execute("""
                     SELECT id, user_id, content, vector_data, metadata, timestamp, context, embedding_type
@@ -7,10 +7,33 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from io import StringIO
+from collections import Counter
 
 # Configuration
 API_BASE_URL = "http://localhost:8000"
 
+def _format_number(value):
+    """Format numeric profile values to two decimals, passing through placeholders like N/A"""
+    return f"{value:.2f}" if isinstance(value, (int, float)) else str(value)
+
+# Formatter for each field of the current user profile table
+_FIELD_FMT = {
+    "User ID": str,
+    "Formality": str,
+    "Enthusiasm": str,
+    "Verbosity": str,
+    "Empathy": str,
+    "Humor": str,
+    "Preferred Greeting": str,
+    "Technical Level": str,
+    "Cultural Context": str,
+    "Age Group": str,
+    "Total Interactions": _format_number,
+    "Successful Tone Matches": _format_number,
+    "Feedback Score": _format_number,
+    "Last Interaction": str,
+}
+
 def check_api_health():
     """Check if the API is running"""
     try:
@@ -138,6 +161,12 @@ def import_user_memory(user_id, memory_json):
     # Placeholder: implement if backend supports memory import
     return False, "Not supported by backend."
 
+@st.cache_data
+def build_profile_table(profile_items):
+    """Build the profile overview table from (field, value) pairs"""
+    rows = [(field, _FIELD_FMT[field](value)) for field, value in profile_items]
+    return pd.DataFrame(rows, columns=["Field", "Value"])
+
 def main():
     st.set_page_config(
         page_title="AI Tone Adaptation System",
@@ -393,11 +422,14 @@ def main():
         with col2:
             if st.button("Clear Chat"):
                 st.session_state.chat_history = []
+                st.session_state.context_counter = Counter()
                 st.rerun()
         
         # Initialize chat history
         if 'chat_history' not in st.session_state:
             st.session_state.chat_history = []
+        if 'context_counter' not in st.session_state:
+            st.session_state.context_counter = Counter()
         
         # Send message
         if send_button and message.strip():
@@ -410,12 +442,14 @@ def main():
                         st.info("ℹ️ A default profile was automatically created for you. You can customize your preferences in the sidebar.")
                     
                     # Add to chat history
+                    chat_context = context if context else "unknown"
                     st.session_state.chat_history.append({
                         "timestamp": datetime.now(),
                         "user_message": message,
-                        "context": context if context else "unknown",
+                        "context": chat_context,
                         "response": response
                     })
+                    st.session_state.context_counter[chat_context] += 1
                     
                     # Display response
                     st.markdown('<div class="response-box">', unsafe_allow_html=True)
@@ -680,9 +714,8 @@ def main():
             else:
                 st.metric("Profile Status", "❌ Not Found")
             
-            if st.session_state.chat_history:
-                contexts = [chat['context'] for chat in st.session_state.chat_history]
-                most_common_context = max(set(contexts), key=contexts.count)
+            if st.session_state.context_counter:
+                most_common_context = st.session_state.context_counter.most_common(1)[0][0]
                 st.metric("Most Common Context", most_common_context)
             else:
                 st.metric("Most Common Context", "N/A")
@@ -724,14 +757,11 @@ def main():
                 "Last Interaction": profile.get("interaction_history", {}).get("last_interaction", "N/A")
             }
             
-            for key, value in profile_data.items():
-                if isinstance(value, (int, float)) and value != "N/A":
-                    try:
-                        st.metric(key, f"{value:.2f}")
-                    except (ValueError, TypeError):
-                        st.metric(key, str(value))
-                else:
-                    st.metric(key, str(value))
+            st.dataframe(
+                build_profile_table(tuple(profile_data.items())),
+                hide_index=True,
+                use_container_width=True
+            )
         else:
             st.info("No profile found for this user. Create a profile in the sidebar first.")
 
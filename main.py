@@ -1,6 +1,6 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import uvicorn
 import os
 
@@ -15,7 +15,8 @@ app = FastAPI(
     description="AI system that adapts communication tone based on user profiles, context, and feedback",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -59,7 +60,7 @@ async def health_check():
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
@@ -73,10 +74,23 @@ if __name__ == "__main__":
     os.makedirs("data", exist_ok=True)
     
     # Run the application
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    ) 
\ No newline at end of file
+    if os.getenv("ENV") == "prod":
+        # One worker per core on uvloop/httptools; reload cannot be combined with workers
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=os.cpu_count() or 1,
+            loop="uvloop",
+            http="httptools",
+            reload=False,
+            log_level="warning"
+        )
+    else:
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,
+            log_level="info"
+        ) 
\ No newline at end of file
@@ -0,0 +1,36 @@
+import pytest
+import orjson
+from pathlib import Path
+from types import MappingProxyType
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--live",
+        action="store_true",
+        default=False,
+        help="run tests that need the API server running on localhost:8000"
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "live: test needs the API server running on localhost:8000")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip live-server tests unless --live was given"""
+    if config.getoption("--live"):
+        return
+    
+    skip_live = pytest.mark.skip(reason="needs a running API server, use --live to run")
+    for item in items:
+        if "live" in item.keywords:
+            item.add_marker(skip_live)
+
+
+@pytest.fixture(scope="session")
+def sample_profiles():
+    """Sample user profiles for testing, loaded once and read-only"""
+    return MappingProxyType(orjson.loads((FIXTURES_DIR / "sample_profiles.json").read_bytes()))
@@ -4,7 +4,9 @@ Tests all four adaptation strategies: baseline matching, dynamic adjustment, lea
 """
 
 import pytest
+import itertools
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 from core.tone_engine import ToneEngine
 from core.profile_parser import ProfileParser, UserProfile, TonePreferences
@@ -26,20 +28,20 @@ class TestAdaptationStrategies:
         """Initialize profile parser"""
         return ProfileParser()
     
-    @pytest.fixture
-    def vector_store(self):
-        """Initialize vector store"""
-        return CustomVectorStore("test_vector_store.db")
+    @pytest.fixture(scope="module")
+    def vector_store(self, tmp_path_factory):
+        """Initialize vector store once per module in a temporary directory"""
+        return CustomVectorStore(str(tmp_path_factory.mktemp("vector_store") / "test_vector_store.db"))
     
     @pytest.fixture
     def prompt_engineer(self):
         """Initialize prompt engineer"""
         return CustomPromptEngineer()
     
-    @pytest.fixture
-    def conversation_manager(self):
-        """Initialize conversation manager"""
-        return CustomConversationManager("test_conversation_manager.db")
+    @pytest.fixture(scope="module")
+    def conversation_manager(self, tmp_path_factory):
+        """Initialize conversation manager once per module in a temporary directory"""
+        return CustomConversationManager(str(tmp_path_factory.mktemp("conversations") / "test_conversation_manager.db"))
     
     @pytest.fixture
     def sample_profile(self):
@@ -207,6 +209,30 @@ class TestAdaptationStrategies:
         
         print("✅ Strategy 4 (Context Switching): PASSED")
     
+    def test_context_switching_with_api_history(self, tone_engine, sample_profile):
+        """Test context switching on history in the shape stored by the chat API"""
+        user_id = "api_history_user"
+        work_prefs = tone_engine.baseline_matching(sample_profile, ContextType.WORK)
+        
+        # Exchanges as recorded in short-term memory by api/chat.py
+        api_history = [
+            {
+                "user_message": f"Work question {i}",
+                "ai_response": "Certainly.",
+                "context": "work",
+                "applied_tone": {},
+                "timestamp": 1700000000.0 + i
+            }
+            for i in range(4)
+        ]
+        
+        tone_engine.context_switching(user_id, work_prefs, ContextType.WORK, api_history[:2])
+        tone_engine.context_switching(user_id, work_prefs, ContextType.PERSONAL, api_history)
+        
+        transition = tone_engine.context_history[user_id][-1]["transition"]
+        assert transition["has_transition"] is True
+        assert transition["transition_type"] == "work_to_personal"
+    
     def test_integrated_adaptation_strategies(self, tone_engine, sample_profile):
         """Test all four strategies working together"""
         user_id = "test_user"
@@ -279,12 +305,46 @@ class TestAdaptationStrategies:
         assert len(similar_vectors) > 0
         assert similar_vectors[0]['similarity'] > 0.5
         
+        # Repeated queries should reuse the cached query embedding
+        hits_before = vector_store.embedding_cache_info().hits
+        vector_store.find_similar(query_content="I have a client meeting", user_id=user_id, limit=5)
+        assert vector_store.embedding_cache_info().hits == hits_before + 1
+        
         # Test context-based search
         work_vectors = vector_store.search_by_context("work", user_id)
         assert len(work_vectors) > 0
         
         print("✅ Vector Store Integration: PASSED")
     
+    def test_vector_store_concurrent_inserts(self, vector_store):
+        """Test that concurrent add_vector calls are all stored and indexed"""
+        user_id = "concurrent_user"
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            vector_ids = list(executor.map(
+                lambda i: vector_store.add_vector(user_id=user_id, content=f"Concurrent message {i}", context="test"),
+                range(100)
+            ))
+        
+        assert len(set(vector_ids)) == 100
+        assert len(vector_store.get_user_vectors(user_id, limit=200)) == 100
+        assert len(vector_store.find_similar(query_content="Concurrent message 7", user_id=user_id, limit=5)) > 0
+    
+    def test_vector_store_sees_other_writers(self, tmp_path):
+        """Test that a store picks up writes made through another instance"""
+        db_path = str(tmp_path / "shared_vector_store.db")
+        reader = CustomVectorStore(db_path)
+        writer = CustomVectorStore(db_path)
+        user_id = "shared_writer_user"
+        
+        writer.add_vector(user_id=user_id, content="Quarterly budget review meeting", context="work")
+        assert len(reader.find_similar(query_content="Quarterly budget review meeting", user_id=user_id)) == 1
+        
+        writer.delete_user_vectors(user_id)
+        assert reader.find_similar(query_content="Quarterly budget review meeting", user_id=user_id) == []
+        
+        print("✅ Vector Store Concurrent Inserts: PASSED")
+    
     def test_prompt_engineering_integration(self, prompt_engineer):
         """Test custom prompt engineering integration"""
         # Test prompt generation
@@ -407,58 +467,45 @@ class TestAdaptationStrategies:
         
         print("✅ Complete System Integration: PASSED")
     
-    def test_performance_benchmarks(self, tone_engine, vector_store, prompt_engineer, conversation_manager):
-        """Test performance benchmarks"""
-        import time
-        
-        # Test tone engine performance
-        start_time = time.time()
-        for i in range(100):
-            # Create a minimal profile for testing
-            minimal_profile = UserProfile(
-                user_id="test_user",
-                tone_preferences=TonePreferences(
-                    formality="professional",
-                    enthusiasm="medium",
-                    verbosity="balanced",
-                    empathy_level="medium",
-                    humor="light"
-                ),
-                communication_style={},
-                interaction_history={},
-                context_preferences={}
-            )
-            tone_engine.baseline_matching(minimal_profile, ContextType.WORK)
-        tone_engine_time = time.time() - start_time
-        
-        # Test vector store performance
-        start_time = time.time()
-        for i in range(100):
-            vector_store.add_vector(
-                user_id=f"user_{i}",
-                content=f"Test message {i}",
-                context="test"
-            )
-        vector_store_time = time.time() - start_time
-        
-        # Test prompt engineering performance
-        start_time = time.time()
-        for i in range(100):
-            prompt_engineer.generate_prompt(
-                prompt_type="conversation_start",
-                variables={"formality": "professional", "enthusiasm": "medium", "context": "work", "message": "test"}
-            )
-        prompt_engineer_time = time.time() - start_time
-        
-        # Performance assertions
-        assert tone_engine_time < 1.0  # Should complete in under 1 second
-        assert vector_store_time < 2.0  # Should complete in under 2 seconds
-        assert prompt_engineer_time < 1.0  # Should complete in under 1 second
-        
-        print(f"✅ Performance Benchmarks: PASSED")
-        print(f"   - Tone Engine: {tone_engine_time:.3f}s")
-        print(f"   - Vector Store: {vector_store_time:.3f}s")
-        print(f"   - Prompt Engineer: {prompt_engineer_time:.3f}s")
+    @pytest.mark.benchmark(group="tone_engine", min_rounds=20)
+    def test_tone_engine_performance(self, benchmark, tone_engine, sample_profile):
+        """Benchmark baseline matching in the tone engine"""
+        result = benchmark(tone_engine.baseline_matching, sample_profile, ContextType.WORK)
+        
+        assert result is not None
+    
+    @pytest.mark.benchmark(group="vector_store")
+    def test_vector_store_performance(self, benchmark, tmp_path):
+        """Benchmark a batched insert of 100 vectors into an empty store"""
+        items = [
+            {"user_id": f"user_{i}", "content": f"Test message {i}", "context": "test"}
+            for i in range(100)
+        ]
+        db_numbers = itertools.count()
+        
+        def fresh_store():
+            # Each round inserts into a new store so earlier rounds don't grow the index
+            store = CustomVectorStore(str(tmp_path / f"bench_{next(db_numbers)}.db"))
+            return (store, items), {}
+        
+        vector_ids = benchmark.pedantic(
+            lambda store, items: store.add_vectors(items),
+            setup=fresh_store,
+            rounds=20
+        )
+        
+        assert len(vector_ids) == 100
+    
+    @pytest.mark.benchmark(group="prompt_engineer", min_rounds=20)
+    def test_prompt_engineer_performance(self, benchmark, prompt_engineer):
+        """Benchmark prompt generation"""
+        prompt = benchmark(
+            prompt_engineer.generate_prompt,
+            prompt_type="conversation_start",
+            variables={"formality": "professional", "enthusiasm": "medium", "context": "work", "message": "test"}
+        )
+        
+        assert "test" in prompt
 
 if __name__ == "__main__":
     # Run all tests
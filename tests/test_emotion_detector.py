@@ -0,0 +1,20 @@
+import pytest
+from core.emotion_detector import EmotionDetector, EmotionType
+
+class TestEmotionDetector:
+    @pytest.fixture(scope="class")
+    def emotion_detector(self):
+        """Create an emotion detector instance"""
+        return EmotionDetector()
+    
+    @pytest.mark.parametrize("message,expected_emotion", [
+        ("I'm so happy today! 😊", EmotionType.JOY),
+        ("I'm feeling really sad 😢", EmotionType.SADNESS),
+        ("I'm so angry about this! 😠", EmotionType.ANGER),
+        ("I'm scared about the results 😨", EmotionType.FEAR),
+        ("Wow! That's amazing! 😲", EmotionType.SURPRISE)
+    ])
+    def test_primary_emotion(self, emotion_detector, message, expected_emotion):
+        """Test primary emotion detection for emotional messages"""
+        result = emotion_detector.detect_emotion(message)
+        assert result["primary_emotion"] == expected_emotion
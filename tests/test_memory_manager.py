@@ -1,59 +1,50 @@
 import pytest
-import tempfile
-import os
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from core.memory_manager import MemoryManager
 
+# Shared timestamp for test exchanges and memory entries
+_T0 = time.time()
+
+def _add_exchanges(memory_manager, user_id, count):
+    """Add count numbered exchanges to a user's short-term memory"""
+    for i in range(count):
+        exchange = {"message": f"Message {i} from {user_id}", "response": f"Response {i}", "timestamp": _T0}
+        memory_manager.add_short_term_memory(user_id, exchange)
+
 class TestMemoryManager:
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def memory_manager(self):
-        """Create a memory manager with temporary database"""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp:
-            db_path = tmp.name
-        
-        yield MemoryManager(db_path=db_path, max_short_term=5, max_long_term_kb=10)
-        
-        # Cleanup
-        os.unlink(db_path)
+        """Create one memory manager with an in-memory database for the class"""
+        return MemoryManager(db_path=":memory:", max_short_term=5, max_long_term_kb=10)
     
-    def test_short_term_memory_add_and_get(self, memory_manager):
-        """Test adding and retrieving short-term memory"""
-        user_id = "test_user"
-        exchange = {"message": "Hello", "response": "Hi there!", "timestamp": time.time()}
-        
-        # Add to short-term memory
-        memory_manager.add_short_term_memory(user_id, exchange)
-        
-        # Retrieve short-term memory
-        memory = memory_manager.get_short_term_memory(user_id)
-        
-        assert len(memory) == 1
-        assert memory[0]["message"] == "Hello"
-        assert memory[0]["response"] == "Hi there!"
+    @pytest.fixture
+    def user_id(self, request):
+        """User id unique to the running test, isolating it within the shared manager"""
+        return f"test_user_{request.node.name}"
     
-    def test_short_term_memory_circular_buffer(self, memory_manager):
-        """Test that short-term memory respects the circular buffer limit"""
-        user_id = "test_user"
-        
-        # Add more exchanges than the limit
-        for i in range(7):  # Limit is 5
-            exchange = {"message": f"Message {i}", "response": f"Response {i}", "timestamp": time.time()}
-            memory_manager.add_short_term_memory(user_id, exchange)
-        
-        # Check that only the last 5 exchanges are kept
+    @pytest.mark.parametrize("count,expected_len,first_index", [
+        (1, 1, 0),  # Single exchange is stored as-is
+        (7, 5, 2),  # Limit is 5, so the first 2 should be dropped
+    ])
+    def test_short_term_memory_add_and_get(self, memory_manager, user_id, count, expected_len, first_index):
+        """Test adding and retrieving short-term memory within the circular buffer limit"""
+        _add_exchanges(memory_manager, user_id, count)
+        
+        # Check that only the most recent exchanges are kept, in order
         memory = memory_manager.get_short_term_memory(user_id)
-        assert len(memory) == 5
-        assert memory[0]["message"] == "Message 2"  # First 2 should be dropped
-        assert memory[4]["message"] == "Message 6"  # Last one should be kept
+        assert len(memory) == expected_len
+        assert memory[0]["message"] == f"Message {first_index} from {user_id}"
+        assert memory[0]["response"] == f"Response {first_index}"
+        assert memory[-1]["message"] == f"Message {count - 1} from {user_id}"  # Last one should be kept
     
-    def test_long_term_memory_add_and_get(self, memory_manager):
+    def test_long_term_memory_add_and_get(self, memory_manager, user_id):
         """Test adding and retrieving long-term memory"""
-        user_id = "test_user"
         memory_data = {
             "context_preferences": {
-                "work": {"count": 5, "last_used": time.time()},
-                "personal": {"count": 3, "last_used": time.time()}
+                "work": {"count": 5, "last_used": _T0},
+                "personal": {"count": 3, "last_used": _T0}
             },
             "tone_effectiveness": {
                 "formality": 0.8,
@@ -73,12 +64,11 @@ class TestMemoryManager:
         assert memory["context_preferences"]["work"]["count"] == 5
         assert memory["tone_effectiveness"]["formality"] == 0.8
     
-    def test_memory_decay(self, memory_manager):
+    def test_memory_decay(self, memory_manager, user_id):
         """Test that memory decays over time"""
-        user_id = "test_user"
         memory_data = {
             "context_preferences": {
-                "work": {"count": 10, "last_used": time.time()}
+                "work": {"count": 10, "last_used": _T0}
             },
             "tone_effectiveness": {
                 "formality": 0.9,
@@ -97,10 +87,8 @@ class TestMemoryManager:
         assert memory is not None
         assert memory["tone_effectiveness"]["formality"] > 0.1  # Should not decay below 10%
     
-    def test_memory_size_limit(self, memory_manager):
+    def test_memory_size_limit(self, memory_manager, user_id):
         """Test that long-term memory respects size limits"""
-        user_id = "test_user"
-        
         # Create a large memory entry
         large_data = {
             "large_field": "x" * 8000,  # 8KB of data
@@ -114,12 +102,10 @@ class TestMemoryManager:
         memory = memory_manager.get_long_term_memory(user_id)
         assert memory is not None
     
-    def test_clear_user_memory(self, memory_manager):
+    def test_clear_user_memory(self, memory_manager, user_id):
         """Test clearing all memory for a user"""
-        user_id = "test_user"
-        
         # Add some memory
-        exchange = {"message": "Hello", "response": "Hi!", "timestamp": time.time()}
+        exchange = {"message": "Hello", "response": "Hi!", "timestamp": _T0}
         memory_manager.add_short_term_memory(user_id, exchange)
         
         memory_data = {"context_preferences": {"work": {"count": 1}}}
@@ -135,12 +121,10 @@ class TestMemoryManager:
         assert len(short_memory) == 0
         assert long_memory is None
     
-    def test_memory_summary(self, memory_manager):
+    def test_memory_summary(self, memory_manager, user_id):
         """Test getting memory summary"""
-        user_id = "test_user"
-        
         # Add some memory
-        exchange = {"message": "Hello", "response": "Hi!", "timestamp": time.time()}
+        exchange = {"message": "Hello", "response": "Hi!", "timestamp": _T0}
         memory_manager.add_short_term_memory(user_id, exchange)
         
         memory_data = {"context_preferences": {"work": {"count": 1}}}
@@ -157,18 +141,13 @@ class TestMemoryManager:
         assert summary["max_short_term"] == 5
         assert summary["max_long_term_kb"] == 10
     
-    def test_multiple_users(self, memory_manager):
+    def test_multiple_users(self, memory_manager, user_id):
         """Test that memory is isolated between users"""
-        user1 = "user1"
-        user2 = "user2"
-        
-        # Add memory for user1
-        exchange1 = {"message": "Hello from user1", "response": "Hi user1!", "timestamp": time.time()}
-        memory_manager.add_short_term_memory(user1, exchange1)
+        user1 = f"{user_id}_1"
+        user2 = f"{user_id}_2"
         
-        # Add memory for user2
-        exchange2 = {"message": "Hello from user2", "response": "Hi user2!", "timestamp": time.time()}
-        memory_manager.add_short_term_memory(user2, exchange2)
+        _add_exchanges(memory_manager, user1, 1)
+        _add_exchanges(memory_manager, user2, 1)
         
         # Verify isolation
         user1_memory = memory_manager.get_short_term_memory(user1)
@@ -176,5 +155,16 @@ class TestMemoryManager:
         
         assert len(user1_memory) == 1
         assert len(user2_memory) == 1
-        assert user1_memory[0]["message"] == "Hello from user1"
-        assert user2_memory[0]["message"] == "Hello from user2" 
\ No newline at end of file
+        assert user1_memory[0]["message"] == f"Message 0 from {user1}"
+        assert user2_memory[0]["message"] == f"Message 0 from {user2}"
+    
+    def test_concurrent_long_term_memory(self, memory_manager, user_id):
+        """Test that threads can share the in-memory database connection"""
+        def write_and_read(i):
+            memory_manager.add_long_term_memory(f"{user_id}_{i}", {"value": i})
+            return memory_manager.get_long_term_memory(f"{user_id}_{i}")
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            memories = list(executor.map(write_and_read, range(50)))
+        
+        assert [memory["value"] for memory in memories] == pytest.approx(list(range(50)), rel=1e-3)
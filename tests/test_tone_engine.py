@@ -1,16 +1,31 @@
 import pytest
 from core.tone_engine import ToneEngine
 from core.profile_parser import UserProfile, TonePreferences, ContextPreferences
+from core.context_analyzer import ContextType
+
+# Messages paired with the context they should be classified as
+CONTEXT_CASES = [
+    ("I have a meeting with the client tomorrow at 2pm", "work"),
+    ("I'm going to a birthday party this weekend", "personal"),
+    ("I need to finish my research paper for the conference", "academic"),
+    ("Hello there", "unknown")
+]
 
 class TestToneEngine:
-    @pytest.fixture
-    def tone_engine(self):
-        """Create a tone engine instance"""
+    @pytest.fixture(scope="session")
+    def shared_tone_engine(self):
+        """Create a single tone engine instance for the session"""
         return ToneEngine()
     
     @pytest.fixture
+    def tone_engine(self, shared_tone_engine):
+        """Hand each test the shared tone engine with per-user state cleared"""
+        shared_tone_engine.reset()
+        return shared_tone_engine
+    
+    @pytest.fixture(scope="session")
     def sample_profile(self):
-        """Create a sample user profile"""
+        """Create a sample user profile, built once per worker"""
         preferences = TonePreferences(
             formality=0.7,
             enthusiasm=0.8,
@@ -41,34 +56,23 @@ class TestToneEngine:
             context_preferences=context_preferences
         )
     
-    def test_context_analysis(self, tone_engine):
+    @pytest.mark.parametrize("message,expected", CONTEXT_CASES)
+    def test_context_analysis(self, tone_engine, message, expected):
         """Test context analysis functionality"""
-        # Test work context
-        work_message = "I have a meeting with the client tomorrow at 2pm"
-        context = tone_engine.context_analyzer.analyze_context(work_message)
-        assert context.value == "work"
-        
-        # Test personal context
-        personal_message = "I'm going to a birthday party this weekend"
-        context = tone_engine.context_analyzer.analyze_context(personal_message)
-        assert context.value == "personal"
-        
-        # Test academic context
-        academic_message = "I need to finish my research paper for the conference"
-        context = tone_engine.context_analyzer.analyze_context(academic_message)
-        assert context.value == "academic"
-        
-        # Test unknown context
-        unknown_message = "Hello there"
-        context = tone_engine.context_analyzer.analyze_context(unknown_message)
-        assert context.value == "unknown"
+        context = tone_engine.context_analyzer.analyze_context(message)
+        assert context.value == expected
+    
+    def test_context_analysis_batch(self, tone_engine):
+        """Test analyzing several messages in one batch call"""
+        messages = [message for message, _ in CONTEXT_CASES]
+        results = tone_engine.context_analyzer.analyze_context_batch(messages)
+        assert [result.value for result in results] == [expected for _, expected in CONTEXT_CASES]
     
     def test_tone_adaptation(self, tone_engine, sample_profile):
         """Test tone adaptation functionality"""
         base_response = "Hello! How can I help you today?"
         
         # Test work context adaptation
-        from core.context_analyzer import ContextType
         adapted_response = tone_engine.adapt_response(
             base_response, sample_profile, ContextType.WORK
         )
@@ -111,8 +115,6 @@ class TestToneEngine:
             )
         )
         
-        from core.context_analyzer import ContextType
-        
         # Test high formality
         formal_response = tone_engine.adapt_response(
             base_response, high_formal_profile, ContextType.WORK
@@ -153,8 +155,6 @@ class TestToneEngine:
             )
         )
         
-        from core.context_analyzer import ContextType
-        
         # Test high enthusiasm
         enthusiastic_response = tone_engine.adapt_response(
             base_response, high_enthusiasm_profile, ContextType.PERSONAL